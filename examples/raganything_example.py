@@ -11,6 +11,7 @@ This example shows how to:
 import os
 import argparse
 import asyncio
+import numpy as np
 from lightrag.llm.openai import openai_complete_if_cache, openai_embed
 from lightrag.raganything import RAGAnything
 
@@ -31,6 +32,20 @@ async def process_with_rag(
         api_key: OpenAI API key
         base_url: Optional base URL for API
     """
+
+    async def embed_sorted_by_length(texts: list[str]) -> np.ndarray:
+        # Embed texts in length order to reduce padding, then restore caller order
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        embeddings = await openai_embed(
+            [texts[i] for i in order],
+            model="text-embedding-3-large",
+            api_key=api_key,
+            base_url=base_url,
+        )
+        result = np.empty_like(embeddings)
+        result[order] = embeddings
+        return result
+
     try:
         # Initialize RAGAnything
         rag = RAGAnything(
@@ -89,12 +104,7 @@ async def process_with_rag(
                 base_url=base_url,
                 **kwargs,
             ),
-            embedding_func=lambda texts: openai_embed(
-                texts,
-                model="text-embedding-3-large",
-                api_key=api_key,
-                base_url=base_url,
-            ),
+            embedding_func=embed_sorted_by_length,
             embedding_dim=3072,
             max_token_size=8192,
         )
@@ -112,10 +122,17 @@ async def process_with_rag(
         ]
 
         print("\nQuerying processed document:")
-        for query in queries:
+        # The queries are independent, so run them concurrently
+        results = await asyncio.gather(
+            *(rag.query_with_multimodal(query, mode="hybrid") for query in queries),
+            return_exceptions=True,
+        )
+        for query, result in zip(queries, results):
             print(f"\nQuery: {query}")
-            result = await rag.query_with_multimodal(query, mode="hybrid")
-            print(f"Answer: {result}")
+            if isinstance(result, Exception):
+                print(f"Error: {str(result)}")
+            else:
+                print(f"Answer: {result}")
 
     except Exception as e:
         print(f"Error processing with RAG: {str(e)}")
@@ -1,4 +1,6 @@
-from datetime import datetime, timedelta
+import hashlib
+import hmac
+import time
 
 import jwt
 from dotenv import load_dotenv
@@ -13,9 +15,16 @@ from .config import global_args
 load_dotenv(dotenv_path=".env", override=False)
 
 
+# Validated tokens are cached for at most this many seconds (never past their expiry)
+TOKEN_CACHE_TTL = 60
+TOKEN_CACHE_MAX_SIZE = 4096
+
+
 class TokenPayload(BaseModel):
+    """Schema of the JWT claims issued by AuthHandler.create_token"""
+
     sub: str  # Username
-    exp: datetime  # Expiration time
+    exp: int  # Expiration time (Unix timestamp)
     role: str = "user"  # User role, default is regular user
     metadata: dict = {}  # Additional metadata
 
@@ -24,6 +33,8 @@ class AuthHandler:
     def __init__(self):
         self.secret = global_args.token_secret
         self.algorithm = global_args.jwt_algorithm
+        # Reused for every decode call; the algorithm is fixed per handler
+        self._algorithms = [self.algorithm]
         self.expire_hours = global_args.token_expire_hours
         self.guest_expire_hours = global_args.guest_token_expire_hours
         self.accounts = {}
@@ -32,6 +43,31 @@ class AuthHandler:
             for account in auth_accounts.split(","):
                 username, password = account.split(":", 1)
                 self.accounts[username] = password
+        # token -> (cache deadline, validated token info)
+        self._token_cache: dict[str, tuple[float, dict]] = {}
+        # Digest index used for constant-time password checks at login
+        self._password_digests = {
+            username: hashlib.sha256(password.encode()).digest()
+            for username, password in self.accounts.items()
+        }
+
+    def verify_password(self, username: str, password: str) -> bool:
+        """
+        Check a username/password pair against the configured accounts
+
+        Args:
+            username: Username
+            password: Plain-text password provided by the client
+
+        Returns:
+            bool: True if the account exists and the password matches
+        """
+        expected = self._password_digests.get(username)
+        if expected is None:
+            return False
+        return hmac.compare_digest(
+            expected, hashlib.sha256(password.encode()).digest()
+        )
 
     def create_token(
         self,
@@ -61,14 +97,17 @@ class AuthHandler:
         else:
             expire_hours = custom_expire_hours
 
-        expire = datetime.utcnow() + timedelta(hours=expire_hours)
+        expire = int(time.time()) + int(expire_hours * 3600)
 
-        # Create payload
-        payload = TokenPayload(
-            sub=username, exp=expire, role=role, metadata=metadata or {}
-        )
+        # Create payload (plain dict matching the TokenPayload schema)
+        payload = {
+            "sub": username,
+            "exp": expire,
+            "role": role,
+            "metadata": metadata or {},
+        }
 
-        return jwt.encode(payload.dict(), self.secret, algorithm=self.algorithm)
+        return jwt.encode(payload, self.secret, algorithm=self.algorithm)
 
     def validate_token(self, token: str) -> dict:
         """
@@ -83,27 +122,41 @@ class AuthHandler:
         Raises:
             HTTPException: If token is invalid or expired
         """
+        now = time.time()
+        cached = self._token_cache.pop(token, None)
+        if cached is not None and now < cached[0]:
+            self._token_cache[token] = cached
+            return cached[1]
+
         try:
-            payload = jwt.decode(token, self.secret, algorithms=[self.algorithm])
+            payload = jwt.decode(token, self.secret, algorithms=self._algorithms)
             expire_timestamp = payload["exp"]
-            expire_time = datetime.utcfromtimestamp(expire_timestamp)
 
-            if datetime.utcnow() > expire_time:
+            if now > expire_timestamp:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired"
                 )
 
             # Return complete payload instead of just username
-            return {
+            token_info = {
                 "username": payload["sub"],
                 "role": payload.get("role", "user"),
                 "metadata": payload.get("metadata", {}),
-                "exp": expire_time,
+                "exp": expire_timestamp,
             }
         except jwt.PyJWTError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
             )
 
+        # Evict the oldest entry once the cache is full
+        if len(self._token_cache) >= TOKEN_CACHE_MAX_SIZE:
+            self._token_cache.pop(next(iter(self._token_cache)))
+        self._token_cache[token] = (
+            min(now + TOKEN_CACHE_TTL, expire_timestamp),
+            token_info,
+        )
+        return token_info
+
 
 auth_handler = AuthHandler()
@@ -3,16 +3,47 @@ This module contains all query-related routes for the LightRAG API.
 """
 
 import json
-import logging
 from typing import Any, Dict, List, Literal, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from lightrag.base import QueryParam
+from lightrag.utils import logger
 from ..utils_api import get_combined_auth_dependency
 from pydantic import BaseModel, Field, field_validator
 
 from ascii_colors import trace_exception
 
+try:
+    import orjson
+
+    def _ndjson_line(obj: dict) -> bytes:
+        """Serialize one streaming record as an NDJSON line"""
+        return orjson.dumps(obj) + b"\n"
+
+    def _ndjson_response_line(chunk: str) -> bytes:
+        """Frame one streamed text chunk as a {"response": ...} NDJSON line"""
+        return b'{"response":' + orjson.dumps(chunk) + b"}\n"
+
+except ImportError:
+
+    def _ndjson_line(obj: dict) -> bytes:
+        """Serialize one streaming record as an NDJSON line"""
+        return (json.dumps(obj) + "\n").encode()
+
+    def _ndjson_response_line(chunk: str) -> bytes:
+        """Frame one streamed text chunk as a {"response": ...} NDJSON line"""
+        return ('{"response": ' + json.dumps(chunk) + "}\n").encode()
+
+
+# Static headers shared by every /query/stream response
+STREAM_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "Content-Type": "application/x-ndjson",
+    "X-Accel-Buffering": "no",  # Ensure proper handling of streaming response when proxied by Nginx
+}
+
 router = APIRouter(tags=["query"])
 
 
@@ -108,8 +139,13 @@ class QueryRequest(BaseModel):
 
     def to_query_params(self, is_stream: bool) -> "QueryParam":
         """Converts a QueryRequest instance into a QueryParam instance."""
-        # Use Pydantic's `.model_dump(exclude_none=True)` to remove None values automatically
-        request_data = self.model_dump(exclude_none=True, exclude={"query"})
+        # Collect non-None fields directly; the values are already validated, so
+        # avoid `.model_dump()` deep-copying lists such as conversation_history
+        request_data = {
+            name: value
+            for name in type(self).model_fields
+            if name != "query" and (value := getattr(self, name)) is not None
+        }
 
         # Ensure `mode` and `stream` are set explicitly
         param = QueryParam(**request_data)
@@ -148,15 +184,14 @@ def create_query_routes(rag, api_key: Optional[str] = None, top_k: int = 60):
             param = request.to_query_params(False)
             response = await rag.aquery(request.query, param=param)
 
-            # If response is a string (e.g. cache hit), return directly
+            # If response is a string (e.g. cache hit), return it directly
             if isinstance(response, str):
-                return QueryResponse(response=response)
-
-            if isinstance(response, dict):
-                result = json.dumps(response, indent=2)
-                return QueryResponse(response=result)
+                resp_text = response
+            elif isinstance(response, dict):
+                resp_text = json.dumps(response, separators=(",", ":"))
             else:
-                return QueryResponse(response=str(response))
+                resp_text = str(response)
+            return QueryResponse(response=resp_text)
         except Exception as e:
             trace_exception(e)
             raise HTTPException(status_code=500, detail=str(e))
@@ -177,31 +212,24 @@ def create_query_routes(rag, api_key: Optional[str] = None, top_k: int = 60):
             param = request.to_query_params(True)
             response = await rag.aquery(request.query, param=param)
 
-            from fastapi.responses import StreamingResponse
-
             async def stream_generator():
                 if isinstance(response, str):
                     # If it's a string, send it all at once
-                    yield f"{json.dumps({'response': response})}\n"
+                    yield _ndjson_line({"response": response})
                 else:
                     # If it's an async generator, send chunks one by one
                     try:
                         async for chunk in response:
                             if chunk:  # Only send non-empty content
-                                yield f"{json.dumps({'response': chunk})}\n"
+                                yield _ndjson_response_line(chunk)
                     except Exception as e:
-                        logging.error(f"Streaming error: {str(e)}")
-                        yield f"{json.dumps({'error': str(e)})}\n"
+                        logger.error("Streaming error: %s", e)
+                        yield _ndjson_line({"error": str(e)})
 
             return StreamingResponse(
                 stream_generator(),
                 media_type="application/x-ndjson",
-                headers={
-                    "Cache-Control": "no-cache",
-                    "Connection": "keep-alive",
-                    "Content-Type": "application/x-ndjson",
-                    "X-Accel-Buffering": "no",  # Ensure proper handling of streaming response when proxied by Nginx
-                },
+                headers=STREAM_HEADERS,
             )
         except Exception as e:
             trace_exception(e)
@@ -838,6 +838,118 @@ class Neo4JStorage(BaseGraphStorage):
             logger.error(f"Error during edge upsert: {str(e)}")
             raise
 
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type(
+            (
+                neo4jExceptions.ServiceUnavailable,
+                neo4jExceptions.TransientError,
+                neo4jExceptions.WriteServiceUnavailable,
+                neo4jExceptions.ClientError,
+            )
+        ),
+    )
+    async def upsert_nodes_batch(self, nodes: list[tuple[str, dict[str, str]]]) -> None:
+        """
+        Upsert multiple nodes in one transaction using UNWIND.
+
+        Nodes are grouped by entity_type since the type is also set as a label,
+        which cannot be parameterized; one query is run per type.
+
+        Args:
+            nodes: A list of (node_id, node_data) tuples
+        """
+        if not nodes:
+            return
+
+        rows_by_type: dict[str, list[dict]] = {}
+        for node_id, node_data in nodes:
+            if "entity_id" not in node_data:
+                raise ValueError(
+                    "Neo4j: node properties must contain an 'entity_id' field"
+                )
+            rows_by_type.setdefault(node_data["entity_type"], []).append(
+                {"entity_id": node_id, "properties": node_data}
+            )
+
+        try:
+            async with self._driver.session(database=self._DATABASE) as session:
+
+                async def execute_upsert(tx: AsyncManagedTransaction):
+                    for entity_type, rows in rows_by_type.items():
+                        query = (
+                            """
+                        UNWIND $rows AS row
+                        MERGE (n:base {entity_id: row.entity_id})
+                        SET n += row.properties
+                        SET n:`%s`
+                        """
+                            % entity_type
+                        )
+                        result = await tx.run(query, rows=rows)
+                        await result.consume()  # Ensure result is fully consumed
+                    logger.debug(f"Upserted {len(nodes)} nodes in batch")
+
+                await session.execute_write(execute_upsert)
+        except Exception as e:
+            logger.error(f"Error during batch node upsert: {str(e)}")
+            raise
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type(
+            (
+                neo4jExceptions.ServiceUnavailable,
+                neo4jExceptions.TransientError,
+                neo4jExceptions.WriteServiceUnavailable,
+                neo4jExceptions.ClientError,
+            )
+        ),
+    )
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """
+        Upsert multiple edges in one transaction using UNWIND.
+        Both endpoints of each edge must already exist, as in upsert_edge.
+
+        Args:
+            edges: A list of (source_node_id, target_node_id, edge_data) tuples
+        """
+        if not edges:
+            return
+
+        rows = [
+            {
+                "source_entity_id": source_node_id,
+                "target_entity_id": target_node_id,
+                "properties": edge_data,
+            }
+            for source_node_id, target_node_id, edge_data in edges
+        ]
+        try:
+            async with self._driver.session(database=self._DATABASE) as session:
+
+                async def execute_upsert(tx: AsyncManagedTransaction):
+                    query = """
+                    UNWIND $rows AS row
+                    MATCH (source:base {entity_id: row.source_entity_id})
+                    WITH source, row
+                    MATCH (target:base {entity_id: row.target_entity_id})
+                    MERGE (source)-[r:DIRECTED]-(target)
+                    SET r += row.properties
+                    """
+                    result = await tx.run(query, rows=rows)
+                    await result.consume()  # Ensure result is fully consumed
+                    logger.debug(f"Upserted {len(edges)} edges in batch")
+
+                await session.execute_write(execute_upsert)
+        except Exception as e:
+            logger.error(f"Error during batch edge upsert: {str(e)}")
+            raise
+
     async def get_knowledge_graph(
         self,
         node_label: str,
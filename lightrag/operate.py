@@ -5,13 +5,14 @@ import asyncio
 import json
 import re
 import os
+import sys
 from typing import Any, AsyncIterator
-from collections import Counter, defaultdict
+from collections import defaultdict
 
 from .utils import (
     logger,
     clean_str,
-    compute_mdhash_id,
+    compute_mdhash_ids_bulk,
     Tokenizer,
     is_float_regex,
     normalize_extracted_info,
@@ -25,6 +26,7 @@ from .utils import (
     CacheData,
     get_conversation_turns,
     use_llm_func_with_cache,
+    statistic_data,
 )
 from .base import (
     BaseGraphStorage,
@@ -42,6 +44,9 @@ from dotenv import load_dotenv
 # the OS environment variables take precedence over the .env file
 load_dotenv(dotenv_path=".env", override=False)
 
+# Body of a single extraction record: everything between the outer parentheses
+_RECORD_RE = re.compile(r"\((.*)\)")
+
 
 def chunking_by_token_size(
     tokenizer: Tokenizer,
@@ -51,30 +56,37 @@ def chunking_by_token_size(
     overlap_token_size: int = 128,
     max_token_size: int = 1024,
 ) -> list[dict[str, Any]]:
-    tokens = tokenizer.encode(content)
     results: list[dict[str, Any]] = []
     if split_by_character:
         raw_chunks = content.split(split_by_character)
+        # Tokenize all split chunks in one batch call
+        raw_chunks_tokens = tokenizer.encode_batch(raw_chunks)
         new_chunks = []
         if split_by_character_only:
-            for chunk in raw_chunks:
-                _tokens = tokenizer.encode(chunk)
+            for chunk, _tokens in zip(raw_chunks, raw_chunks_tokens):
                 new_chunks.append((len(_tokens), chunk))
         else:
-            for chunk in raw_chunks:
-                _tokens = tokenizer.encode(chunk)
+            # Windows of oversized chunks are collected with their position in
+            # new_chunks and decoded together in one batch call afterwards
+            window_indexes = []
+            windows = []
+            for chunk, _tokens in zip(raw_chunks, raw_chunks_tokens):
                 if len(_tokens) > max_token_size:
                     for start in range(
                         0, len(_tokens), max_token_size - overlap_token_size
                     ):
-                        chunk_content = tokenizer.decode(
-                            _tokens[start : start + max_token_size]
-                        )
+                        window_indexes.append(len(new_chunks))
+                        windows.append(_tokens[start : start + max_token_size])
                         new_chunks.append(
-                            (min(max_token_size, len(_tokens) - start), chunk_content)
+                            (min(max_token_size, len(_tokens) - start), None)
                         )
                 else:
                     new_chunks.append((len(_tokens), chunk))
+            if windows:
+                for index, chunk_content in zip(
+                    window_indexes, tokenizer.decode_batch(windows)
+                ):
+                    new_chunks[index] = (new_chunks[index][0], chunk_content)
         for index, (_len, chunk) in enumerate(new_chunks):
             results.append(
                 {
@@ -84,10 +96,13 @@ def chunking_by_token_size(
                 }
             )
     else:
-        for index, start in enumerate(
-            range(0, len(tokens), max_token_size - overlap_token_size)
-        ):
-            chunk_content = tokenizer.decode(tokens[start : start + max_token_size])
+        tokens = tokenizer.encode(content)
+        starts = range(0, len(tokens), max_token_size - overlap_token_size)
+        # Decode all windows in one batch call
+        chunk_contents = tokenizer.decode_batch(
+            [tokens[start : start + max_token_size] for start in starts]
+        )
+        for index, (start, chunk_content) in enumerate(zip(starts, chunk_contents)):
             results.append(
                 {
                     "tokens": min(max_token_size, len(tokens) - start),
@@ -110,10 +125,6 @@ async def _handle_entity_relation_summary(
     For each entity or relation, input is the combined description of already existing description and new description.
     If too long, use LLM to summarize.
     """
-    use_llm_func: callable = global_config["llm_model_func"]
-    # Apply higher priority (8) to entity/relation summary tasks
-    use_llm_func = partial(use_llm_func, _priority=8)
-
     tokenizer: Tokenizer = global_config["tokenizer"]
     llm_max_tokens = global_config["llm_model_max_token_size"]
     summary_max_tokens = global_config["summary_to_max_tokens"]
@@ -121,6 +132,37 @@ async def _handle_entity_relation_summary(
     language = global_config["addon_params"].get(
         "language", PROMPTS["DEFAULT_LANGUAGE"]
     )
+    prompt_template = PROMPTS["summarize_entity_descriptions"]
+
+    # The summary is determined by the merged description itself, so key the cache
+    # on its content (fields JSON-encoded so they cannot run into each other) and
+    # check it before paying for tokenization
+    args_hash = compute_args_hash(
+        json.dumps(
+            [
+                global_config.get("llm_model_name", ""),
+                prompt_template,
+                language,
+                llm_max_tokens,
+                summary_max_tokens,
+                entity_or_relation_name,
+                description,
+            ],
+            ensure_ascii=False,
+        ),
+        cache_type="summary",
+    )
+    cached_summary, _, _, _ = await handle_cache(
+        llm_response_cache,
+        args_hash,
+        description,
+        "default",
+        cache_type="summary",
+    )
+    if cached_summary:
+        logger.debug(f"Found summary cache for {entity_or_relation_name}")
+        statistic_data["llm_cache"] += 1
+        return cached_summary
 
     tokens = tokenizer.encode(description)
 
@@ -128,7 +170,6 @@ async def _handle_entity_relation_summary(
     # if len(tokens) < summary_max_tokens:  # No need for summary
     #     return description
 
-    prompt_template = PROMPTS["summarize_entity_descriptions"]
     use_description = tokenizer.decode(tokens[:llm_max_tokens])
     context_base = dict(
         entity_name=entity_or_relation_name,
@@ -138,18 +179,24 @@ async def _handle_entity_relation_summary(
     use_prompt = prompt_template.format(**context_base)
     logger.debug(f"Trigger summary: {entity_or_relation_name}")
 
-    # Use LLM function with cache (higher priority for summary generation)
+    use_llm_func: callable = global_config["llm_model_func"]
+    # Apply higher priority (8) to entity/relation summary tasks
+    use_llm_func = partial(use_llm_func, _priority=8)
+
+    # The cache was already checked above: call LLM and save under the content key
     summary = await use_llm_func_with_cache(
         use_prompt,
         use_llm_func,
         llm_response_cache=llm_response_cache,
         max_tokens=summary_max_tokens,
-        cache_type="extract",
+        cache_type="summary",
+        args_hash=args_hash,
+        skip_cache_lookup=True,
     )
     return summary
 
 
-async def _handle_single_entity_extraction(
+def _handle_single_entity_extraction(
     record_attributes: list[str],
     chunk_key: str,
     file_path: str = "unknown_source",
@@ -195,7 +242,7 @@ async def _handle_single_entity_extraction(
     )
 
 
-async def _handle_single_relationship_extraction(
+def _handle_single_relationship_extraction(
     record_attributes: list[str],
     chunk_key: str,
     file_path: str = "unknown_source",
@@ -224,11 +271,8 @@ async def _handle_single_relationship_extraction(
     edge_keywords = edge_keywords.replace("，", ",")
 
     edge_source_id = chunk_key
-    weight = (
-        float(record_attributes[-1].strip('"').strip("'"))
-        if is_float_regex(record_attributes[-1].strip('"').strip("'"))
-        else 1.0
-    )
+    weight_str = record_attributes[-1].strip('"').strip("'")
+    weight = float(weight_str) if is_float_regex(weight_str) else 1.0
     return dict(
         src_id=source,
         tgt_id=target,
@@ -240,6 +284,15 @@ async def _handle_single_relationship_extraction(
     )
 
 
+def _dedupe_description_fragments(fragments: list[str]) -> list[str]:
+    """Drop fragments differing only in case or surrounding whitespace, keeping the
+    first spelling seen, and return the rest sorted."""
+    unique_fragments = {}
+    for fragment in fragments:
+        unique_fragments.setdefault(fragment.strip().lower(), fragment)
+    return sorted(unique_fragments.values())
+
+
 async def _merge_nodes_then_upsert(
     entity_name: str,
     nodes_data: list[dict],
@@ -248,45 +301,63 @@ async def _merge_nodes_then_upsert(
     pipeline_status: dict = None,
     pipeline_status_lock=None,
     llm_response_cache: BaseKVStorage | None = None,
+    *,
+    already_node: dict | None,
+    pending_nodes: dict[str, dict],
 ):
-    """Get existing nodes from knowledge graph use name,if exists, merge data, else create, then upsert."""
+    """Merge new data into the existing node (if any) and queue it for upsert.
+
+    The existing node is looked up by the caller in one batch read and passed in
+    as `already_node` (None when the entity is not yet in the knowledge graph).
+    The merged node is recorded in `pending_nodes` for the caller to write in
+    one batch.
+    """
     already_entity_types = []
-    already_source_ids = []
     already_description = []
-    already_file_paths = []
+    # Stored and new source ids / file paths are unioned into these sets
+    source_ids: set[str] = set()
+    file_paths: set[str] = set()
 
-    already_node = await knowledge_graph_inst.get_node(entity_name)
     if already_node:
         already_entity_types.append(already_node["entity_type"])
-        already_source_ids.extend(
+        source_ids.update(
             split_string_by_multi_markers(already_node["source_id"], [GRAPH_FIELD_SEP])
         )
-        already_file_paths.extend(
+        file_paths.update(
             split_string_by_multi_markers(already_node["file_path"], [GRAPH_FIELD_SEP])
         )
-        already_description.append(already_node["description"])
+        already_description.extend(
+            split_string_by_multi_markers(
+                already_node["description"], [GRAPH_FIELD_SEP]
+            )
+        )
 
-    entity_type = sorted(
-        Counter(
-            [dp["entity_type"] for dp in nodes_data] + already_entity_types
-        ).items(),
-        key=lambda x: x[1],
-        reverse=True,
-    )[0][0]
-    description = GRAPH_FIELD_SEP.join(
-        sorted(set([dp["description"] for dp in nodes_data] + already_description))
-    )
-    source_id = GRAPH_FIELD_SEP.join(
-        set([dp["source_id"] for dp in nodes_data] + already_source_ids)
-    )
-    file_path = GRAPH_FIELD_SEP.join(
-        set([dp["file_path"] for dp in nodes_data] + already_file_paths)
+    # Collect all fields of the new records in a single pass
+    entity_type_counts: dict[str, int] = {}
+    new_descriptions = []
+    for dp in nodes_data:
+        entity_type_counts[dp["entity_type"]] = (
+            entity_type_counts.get(dp["entity_type"], 0) + 1
+        )
+        new_descriptions.append(dp["description"])
+        source_ids.add(dp["source_id"])
+        file_paths.add(dp["file_path"])
+
+    # Majority vote over entity types; ties go to the first type seen
+    for already_type in already_entity_types:
+        entity_type_counts[already_type] = entity_type_counts.get(already_type, 0) + 1
+    entity_type = max(entity_type_counts.items(), key=lambda x: x[1])[0]
+    description_fragments = _dedupe_description_fragments(
+        already_description + new_descriptions
     )
+    description = GRAPH_FIELD_SEP.join(description_fragments)
+    source_id = GRAPH_FIELD_SEP.join(source_ids)
+    file_path = GRAPH_FIELD_SEP.join(file_paths)
 
     force_llm_summary_on_merge = global_config["force_llm_summary_on_merge"]
 
-    num_fragment = description.count(GRAPH_FIELD_SEP) + 1
-    num_new_fragment = len(set([dp["description"] for dp in nodes_data]))
+    num_fragment = len(description_fragments)
+    num_new_fragment = len(_dedupe_description_fragments(new_descriptions))
 
     if num_fragment > 1:
         if num_fragment >= force_llm_summary_on_merge:
@@ -320,10 +391,7 @@ async def _merge_nodes_then_upsert(
         file_path=file_path,
         created_at=int(time.time()),
     )
-    await knowledge_graph_inst.upsert_node(
-        entity_name,
-        node_data=node_data,
-    )
+    pending_nodes[entity_name] = dict(node_data)
     node_data["entity_name"] = entity_name
     return node_data
 
@@ -337,61 +405,66 @@ async def _merge_edges_then_upsert(
     pipeline_status: dict = None,
     pipeline_status_lock=None,
     llm_response_cache: BaseKVStorage | None = None,
+    *,
+    already_edge: dict | None,
+    existing_node_ids: set[str],
+    pending_nodes: dict[str, dict],
+    pending_edges: dict[tuple[str, str], dict],
 ):
+    """Merge new data into the existing edge (if any) and queue it for upsert.
+
+    The existing edge and the set of node ids already in the knowledge graph are
+    looked up by the caller in batch reads. Endpoints missing from
+    `existing_node_ids` are queued as UNKNOWN nodes in `pending_nodes` and added
+    to the set; the merged edge is recorded in `pending_edges`. The caller writes
+    both in batch.
+    """
     if src_id == tgt_id:
         return None
 
     already_weights = []
-    already_source_ids = []
     already_description = []
     already_keywords = []
-    already_file_paths = []
-
-    if await knowledge_graph_inst.has_edge(src_id, tgt_id):
-        already_edge = await knowledge_graph_inst.get_edge(src_id, tgt_id)
-        # Handle the case where get_edge returns None or missing fields
-        if already_edge:
-            # Get weight with default 0.0 if missing
-            already_weights.append(already_edge.get("weight", 0.0))
-
-            # Get source_id with empty string default if missing or None
-            if already_edge.get("source_id") is not None:
-                already_source_ids.extend(
-                    split_string_by_multi_markers(
-                        already_edge["source_id"], [GRAPH_FIELD_SEP]
-                    )
+    # Stored and new source ids / file paths are unioned into these sets
+    source_ids: set[str] = set()
+    file_paths: set[str] = set()
+
+    # Handle the case where the edge does not exist or has missing fields
+    if already_edge:
+        # Get weight with default 0.0 if missing
+        already_weights.append(already_edge.get("weight", 0.0))
+
+        # Get source_id with empty string default if missing or None
+        if already_edge.get("source_id") is not None:
+            source_ids.update(
+                split_string_by_multi_markers(
+                    already_edge["source_id"], [GRAPH_FIELD_SEP]
                 )
+            )
 
-            # Get file_path with empty string default if missing or None
-            if already_edge.get("file_path") is not None:
-                already_file_paths.extend(
-                    split_string_by_multi_markers(
-                        already_edge["file_path"], [GRAPH_FIELD_SEP]
-                    )
+        # Get file_path with empty string default if missing or None
+        if already_edge.get("file_path") is not None:
+            file_paths.update(
+                split_string_by_multi_markers(
+                    already_edge["file_path"], [GRAPH_FIELD_SEP]
                 )
+            )
 
-            # Get description with empty string default if missing or None
-            if already_edge.get("description") is not None:
-                already_description.append(already_edge["description"])
-
-            # Get keywords with empty string default if missing or None
-            if already_edge.get("keywords") is not None:
-                already_keywords.extend(
-                    split_string_by_multi_markers(
-                        already_edge["keywords"], [GRAPH_FIELD_SEP]
-                    )
+        # Get description with empty string default if missing or None
+        if already_edge.get("description") is not None:
+            already_description.extend(
+                split_string_by_multi_markers(
+                    already_edge["description"], [GRAPH_FIELD_SEP]
                 )
+            )
 
-    # Process edges_data with None checks
-    weight = sum([dp["weight"] for dp in edges_data] + already_weights)
-    description = GRAPH_FIELD_SEP.join(
-        sorted(
-            set(
-                [dp["description"] for dp in edges_data if dp.get("description")]
-                + already_description
+        # Get keywords with empty string default if missing or None
+        if already_edge.get("keywords") is not None:
+            already_keywords.extend(
+                split_string_by_multi_markers(
+                    already_edge["keywords"], [GRAPH_FIELD_SEP]
+                )
             )
-        )
-    )
 
     # Split all existing and new keywords into individual terms, then combine and deduplicate
     all_keywords = set()
@@ -399,30 +472,39 @@ async def _merge_edges_then_upsert(
     for keyword_str in already_keywords:
         if keyword_str:  # Skip empty strings
             all_keywords.update(k.strip() for k in keyword_str.split(",") if k.strip())
-    # Process new keywords from edges_data
-    for edge in edges_data:
-        if edge.get("keywords"):
+
+    # Process edges_data with None checks, collecting all fields in a single pass
+    weight = sum(already_weights)
+    new_descriptions = []
+    for dp in edges_data:
+        weight += dp["weight"]
+        if dp.get("description"):
+            new_descriptions.append(dp["description"])
+        if dp.get("keywords"):
             all_keywords.update(
-                k.strip() for k in edge["keywords"].split(",") if k.strip()
+                k.strip() for k in dp["keywords"].split(",") if k.strip()
             )
+        if dp.get("source_id"):
+            source_ids.add(dp["source_id"])
+        if dp.get("file_path"):
+            file_paths.add(dp["file_path"])
+
+    description_fragments = _dedupe_description_fragments(
+        already_description + new_descriptions
+    )
+    description = GRAPH_FIELD_SEP.join(description_fragments)
     # Join all unique keywords with commas
     keywords = ",".join(sorted(all_keywords))
+    source_id = GRAPH_FIELD_SEP.join(source_ids)
+    file_path = GRAPH_FIELD_SEP.join(file_paths)
 
-    source_id = GRAPH_FIELD_SEP.join(
-        set(
-            [dp["source_id"] for dp in edges_data if dp.get("source_id")]
-            + already_source_ids
-        )
-    )
-    file_path = GRAPH_FIELD_SEP.join(
-        set(
-            [dp["file_path"] for dp in edges_data if dp.get("file_path")]
-            + already_file_paths
-        )
-    )
+    # One timestamp for the placeholder nodes and the edge itself
+    now = int(time.time())
 
     for need_insert_id in [src_id, tgt_id]:
-        if not (await knowledge_graph_inst.has_node(need_insert_id)):
+        if need_insert_id not in existing_node_ids:
+            # Mark as existing so other edge merges don't queue it again
+            existing_node_ids.add(need_insert_id)
             # # Discard this edge if the node does not exist
             # if need_insert_id == src_id:
             #     logger.warning(
@@ -433,24 +515,20 @@ async def _merge_edges_then_upsert(
             #         f"Discard edge: {src_id} - {tgt_id} | Target node missing"
             #     )
             # return None
-            await knowledge_graph_inst.upsert_node(
-                need_insert_id,
-                node_data={
-                    "entity_id": need_insert_id,
-                    "source_id": source_id,
-                    "description": description,
-                    "entity_type": "UNKNOWN",
-                    "file_path": file_path,
-                    "created_at": int(time.time()),
-                },
-            )
+            placeholder_node = {
+                "entity_id": need_insert_id,
+                "source_id": source_id,
+                "description": description,
+                "entity_type": "UNKNOWN",
+                "file_path": file_path,
+                "created_at": now,
+            }
+            pending_nodes[need_insert_id] = placeholder_node
 
     force_llm_summary_on_merge = global_config["force_llm_summary_on_merge"]
 
-    num_fragment = description.count(GRAPH_FIELD_SEP) + 1
-    num_new_fragment = len(
-        set([dp["description"] for dp in edges_data if dp.get("description")])
-    )
+    num_fragment = len(description_fragments)
+    num_new_fragment = len(_dedupe_description_fragments(new_descriptions))
 
     if num_fragment > 1:
         if num_fragment >= force_llm_summary_on_merge:
@@ -476,28 +554,17 @@ async def _merge_edges_then_upsert(
                     pipeline_status["latest_message"] = status_message
                     pipeline_status["history_messages"].append(status_message)
 
-    await knowledge_graph_inst.upsert_edge(
-        src_id,
-        tgt_id,
-        edge_data=dict(
-            weight=weight,
-            description=description,
-            keywords=keywords,
-            source_id=source_id,
-            file_path=file_path,
-            created_at=int(time.time()),
-        ),
-    )
-
-    edge_data = dict(
-        src_id=src_id,
-        tgt_id=tgt_id,
+    upsert_edge_data = dict(
+        weight=weight,
         description=description,
         keywords=keywords,
         source_id=source_id,
         file_path=file_path,
-        created_at=int(time.time()),
+        created_at=now,
     )
+    pending_edges[(src_id, tgt_id)] = upsert_edge_data
+
+    edge_data = dict(src_id=src_id, tgt_id=tgt_id, **upsert_edge_data)
 
     return edge_data
 
@@ -544,10 +611,6 @@ async def merge_nodes_and_edges(
             sorted_edge_key = tuple(sorted(edge_key))
             all_edges[sorted_edge_key].extend(edges)
 
-    # Centralized processing of all nodes and edges
-    entities_data = []
-    relationships_data = []
-
     # Merge nodes and edges
     # Use graph database lock to ensure atomic merges and updates
     graph_db_lock = get_graph_db_lock(enable_logging=False)
@@ -560,33 +623,88 @@ async def merge_nodes_and_edges(
             pipeline_status["latest_message"] = log_message
             pipeline_status["history_messages"].append(log_message)
 
-        # Process and update all entities at once
-        for entity_name, entities in all_nodes.items():
-            entity_data = await _merge_nodes_then_upsert(
-                entity_name,
-                entities,
-                knowledge_graph_inst,
-                global_config,
-                pipeline_status,
-                pipeline_status_lock,
-                llm_response_cache,
-            )
-            entities_data.append(entity_data)
-
-        # Process and update all relationships at once
-        for edge_key, edges in all_edges.items():
-            edge_data = await _merge_edges_then_upsert(
-                edge_key[0],
-                edge_key[1],
-                edges,
-                knowledge_graph_inst,
-                global_config,
-                pipeline_status,
-                pipeline_status_lock,
-                llm_response_cache,
+        # Read all existing nodes and edges touched by this merge in batch calls
+        already_nodes = await knowledge_graph_inst.get_nodes_batch(
+            list(all_nodes.keys())
+        )
+        already_edges = await knowledge_graph_inst.get_edges_batch(
+            [{"src": edge_key[0], "tgt": edge_key[1]} for edge_key in all_edges]
+        )
+        # Endpoints not merged as entities here may still exist in the graph
+        other_node_ids = {
+            node_id for edge_key in all_edges for node_id in edge_key
+        } - all_nodes.keys()
+        existing_node_ids = set(all_nodes.keys())
+        if other_node_ids:
+            other_nodes = await knowledge_graph_inst.get_nodes_batch(
+                list(other_node_ids)
             )
-            if edge_data is not None:
-                relationships_data.append(edge_data)
+            existing_node_ids.update(other_nodes.keys())
+
+        # Merged results are collected here and written in batch once all
+        # merges (including any LLM summaries) are done
+        pending_nodes: dict[str, dict] = {}
+        pending_edges: dict[tuple[str, str], dict] = {}
+
+        # Merges of different entities (and of different relationships) are
+        # independent, so run them concurrently with bounded parallelism
+        semaphore = asyncio.Semaphore(global_config.get("llm_model_max_async", 4))
+
+        async def _merge_node_with_semaphore(entity_name, entities):
+            async with semaphore:
+                return await _merge_nodes_then_upsert(
+                    entity_name,
+                    entities,
+                    knowledge_graph_inst,
+                    global_config,
+                    pipeline_status,
+                    pipeline_status_lock,
+                    llm_response_cache,
+                    already_node=already_nodes.get(entity_name),
+                    pending_nodes=pending_nodes,
+                )
+
+        async def _merge_edge_with_semaphore(edge_key, edges):
+            async with semaphore:
+                return await _merge_edges_then_upsert(
+                    edge_key[0],
+                    edge_key[1],
+                    edges,
+                    knowledge_graph_inst,
+                    global_config,
+                    pipeline_status,
+                    pipeline_status_lock,
+                    llm_response_cache,
+                    already_edge=already_edges.get(edge_key),
+                    existing_node_ids=existing_node_ids,
+                    pending_nodes=pending_nodes,
+                    pending_edges=pending_edges,
+                )
+
+        # Process and update all entities at once
+        entities_data = await asyncio.gather(
+            *[
+                _merge_node_with_semaphore(entity_name, entities)
+                for entity_name, entities in all_nodes.items()
+            ]
+        )
+
+        # Process and update all relationships once all entities are in place
+        edges_results = await asyncio.gather(
+            *[
+                _merge_edge_with_semaphore(edge_key, edges)
+                for edge_key, edges in all_edges.items()
+            ]
+        )
+        relationships_data = [
+            edge_data for edge_data in edges_results if edge_data is not None
+        ]
+
+        # Nodes (including placeholder endpoints) must exist before their edges
+        await knowledge_graph_inst.upsert_nodes_batch(list(pending_nodes.items()))
+        await knowledge_graph_inst.upsert_edges_batch(
+            [(src, tgt, edge_data) for (src, tgt), edge_data in pending_edges.items()]
+        )
 
         # Update total counts
         total_entities_count = len(entities_data)
@@ -599,19 +717,24 @@ async def merge_nodes_and_edges(
                 pipeline_status["latest_message"] = log_message
                 pipeline_status["history_messages"].append(log_message)
 
-        # Update vector databases with all collected data
+        # Update vector databases with all collected data; entity and relationship
+        # embeddings are independent, so both upserts run concurrently
+        vdb_upserts = []
         if entity_vdb is not None and entities_data:
-            data_for_vdb = {
-                compute_mdhash_id(dp["entity_name"], prefix="ent-"): {
+            entity_ids = compute_mdhash_ids_bulk(
+                [dp["entity_name"] for dp in entities_data], prefix="ent-"
+            )
+            entity_data_for_vdb = {
+                entity_id: {
                     "entity_name": dp["entity_name"],
                     "entity_type": dp["entity_type"],
                     "content": f"{dp['entity_name']}\n{dp['description']}",
                     "source_id": dp["source_id"],
                     "file_path": dp.get("file_path", "unknown_source"),
                 }
-                for dp in entities_data
+                for entity_id, dp in zip(entity_ids, entities_data)
             }
-            await entity_vdb.upsert(data_for_vdb)
+            vdb_upserts.append(entity_vdb.upsert(entity_data_for_vdb))
 
         log_message = f"Updating {total_relations_count} relations {current_file_number}/{total_files}: {file_path}"
         logger.info(log_message)
@@ -621,8 +744,12 @@ async def merge_nodes_and_edges(
                 pipeline_status["history_messages"].append(log_message)
 
         if relationships_vdb is not None and relationships_data:
-            data_for_vdb = {
-                compute_mdhash_id(dp["src_id"] + dp["tgt_id"], prefix="rel-"): {
+            relation_ids = compute_mdhash_ids_bulk(
+                [dp["src_id"] + dp["tgt_id"] for dp in relationships_data],
+                prefix="rel-",
+            )
+            relation_data_for_vdb = {
+                relation_id: {
                     "src_id": dp["src_id"],
                     "tgt_id": dp["tgt_id"],
                     "keywords": dp["keywords"],
@@ -630,9 +757,11 @@ async def merge_nodes_and_edges(
                     "source_id": dp["source_id"],
                     "file_path": dp.get("file_path", "unknown_source"),
                 }
-                for dp in relationships_data
+                for relation_id, dp in zip(relation_ids, relationships_data)
             }
-            await relationships_vdb.upsert(data_for_vdb)
+            vdb_upserts.append(relationships_vdb.upsert(relation_data_for_vdb))
+
+        await asyncio.gather(*vdb_upserts)
 
 
 async def extract_entities(
@@ -687,7 +816,13 @@ async def extract_entities(
     processed_chunks = 0
     total_chunks = len(ordered_chunks)
 
-    async def _process_extraction_result(
+    record_markers = [
+        context_base["record_delimiter"],
+        context_base["completion_delimiter"],
+    ]
+    tuple_markers = [context_base["tuple_delimiter"]]
+
+    def _process_extraction_result(
         result: str, chunk_key: str, file_path: str = "unknown_source"
     ):
         """Process a single extraction result (either initial or gleaning)
@@ -701,28 +836,24 @@ async def extract_entities(
         maybe_nodes = defaultdict(list)
         maybe_edges = defaultdict(list)
 
-        records = split_string_by_multi_markers(
-            result,
-            [context_base["record_delimiter"], context_base["completion_delimiter"]],
-        )
+        records = split_string_by_multi_markers(result, record_markers)
 
         for record in records:
-            record = re.search(r"\((.*)\)", record)
+            record = _RECORD_RE.search(record)
             if record is None:
                 continue
-            record = record.group(1)
             record_attributes = split_string_by_multi_markers(
-                record, [context_base["tuple_delimiter"]]
+                record.group(1), tuple_markers
             )
 
-            if_entities = await _handle_single_entity_extraction(
+            if_entities = _handle_single_entity_extraction(
                 record_attributes, chunk_key, file_path
             )
             if if_entities is not None:
                 maybe_nodes[if_entities["entity_name"]].append(if_entities)
                 continue
 
-            if_relation = await _handle_single_relationship_extraction(
+            if_relation = _handle_single_relationship_extraction(
                 record_attributes, chunk_key, file_path
             )
             if if_relation is not None:
@@ -761,7 +892,7 @@ async def extract_entities(
         history = pack_user_ass_to_openai_messages(hint_prompt, final_result)
 
         # Process initial extraction with file path
-        maybe_nodes, maybe_edges = await _process_extraction_result(
+        maybe_nodes, maybe_edges = _process_extraction_result(
             final_result, chunk_key, file_path
         )
 
@@ -778,7 +909,7 @@ async def extract_entities(
             history += pack_user_ass_to_openai_messages(continue_prompt, glean_result)
 
             # Process gleaning result separately with file path
-            glean_nodes, glean_edges = await _process_extraction_result(
+            glean_nodes, glean_edges = _process_extraction_result(
                 glean_result, chunk_key, file_path
             )
 
@@ -829,32 +960,46 @@ async def extract_entities(
         async with semaphore:
             return await _process_single_content(chunk)
 
-    tasks = []
-    for c in ordered_chunks:
-        task = asyncio.create_task(_process_with_semaphore(c))
-        tasks.append(task)
-
-    # Wait for tasks to complete or for the first exception to occur
-    # This allows us to cancel remaining tasks if any task fails
-    done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
-
-    # Check if any task raised an exception
-    for task in done:
-        if task.exception():
-            # If a task failed, cancel all pending tasks
-            # This prevents unnecessary processing since the parent function will abort anyway
-            for pending_task in pending:
-                pending_task.cancel()
-
-            # Wait for cancellation to complete
-            if pending:
-                await asyncio.wait(pending)
-
-            # Re-raise the exception to notify the caller
-            raise task.exception()
-
-    # If all tasks completed successfully, collect results
-    chunk_results = [task.result() for task in tasks]
+    if sys.version_info >= (3, 11):
+        # TaskGroup cancels the remaining tasks as soon as one task fails
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tasks = [
+                    tg.create_task(_process_with_semaphore(c)) for c in ordered_chunks
+                ]
+        except ExceptionGroup as eg:  # noqa: F821 (builtin on Python 3.11+)
+            # Re-raise the first failure itself rather than the ExceptionGroup,
+            # as on older Python versions
+            raise eg.exceptions[0]
+
+        chunk_results = [task.result() for task in tasks]
+    else:
+        tasks = []
+        for c in ordered_chunks:
+            task = asyncio.create_task(_process_with_semaphore(c))
+            tasks.append(task)
+
+        # Wait for tasks to complete or for the first exception to occur
+        # This allows us to cancel remaining tasks if any task fails
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+
+        # Check if any task raised an exception
+        for task in done:
+            if task.exception():
+                # If a task failed, cancel all pending tasks
+                # This prevents unnecessary processing since the parent function will abort anyway
+                for pending_task in pending:
+                    pending_task.cancel()
+
+                # Wait for cancellation to complete
+                if pending:
+                    await asyncio.wait(pending)
+
+                # Re-raise the exception to notify the caller
+                raise task.exception()
+
+        # If all tasks completed successfully, collect results
+        chunk_results = [task.result() for task in tasks]
 
     # Return the chunk_results for later processing in merge_nodes_and_edges
     return chunk_results
@@ -10,7 +10,7 @@ import logging.handlers
 import os
 import re
 from dataclasses import dataclass
-from functools import wraps
+from functools import lru_cache, wraps
 from hashlib import md5
 from typing import Any, Protocol, Callable, TYPE_CHECKING, List
 import numpy as np
@@ -241,12 +241,21 @@ class EmbeddingFunc:
         return await self.func(*args, **kwargs)
 
 
+_JSON_BODY_RE = re.compile(r"{.*}", re.DOTALL)
+
+
 def locate_json_string_body_from_string(content: str) -> str | None:
     """Locate the JSON string body from a string"""
     try:
-        maybe_json_str = re.search(r"{.*}", content, re.DOTALL)
+        stripped = content.strip()
+        if stripped[:1] == "{" and stripped[-1:] == "}":
+            # Fast path: the whole response is already a JSON object
+            maybe_json_str = stripped
+        else:
+            maybe_json_str = _JSON_BODY_RE.search(content)
+            if maybe_json_str is not None:
+                maybe_json_str = maybe_json_str.group(0)
         if maybe_json_str is not None:
-            maybe_json_str = maybe_json_str.group(0)
             maybe_json_str = maybe_json_str.replace("\\n", "")
             maybe_json_str = maybe_json_str.replace("\n", "")
             maybe_json_str = maybe_json_str.replace("'", '"')
@@ -306,6 +315,13 @@ def compute_mdhash_id(content: str, prefix: str = "") -> str:
     return prefix + md5(content.encode()).hexdigest()
 
 
+def compute_mdhash_ids_bulk(contents: list[str], prefix: str = "") -> list[str]:
+    """
+    Compute IDs for many content strings at once, same as compute_mdhash_id on each.
+    """
+    return [prefix + md5(content.encode()).hexdigest() for content in contents]
+
+
 # Custom exception class
 class QueueFullError(Exception):
     """Raised when the queue is full and the wait times out"""
@@ -671,6 +687,30 @@ class Tokenizer:
         """
         return self.tokenizer.decode(tokens)
 
+    def encode_batch(self, contents: List[str]) -> List[List[int]]:
+        """
+        Encodes a list of strings into lists of tokens.
+
+        Args:
+            contents: The strings to encode.
+
+        Returns:
+            A list of token lists, one per input string.
+        """
+        return [self.encode(content) for content in contents]
+
+    def decode_batch(self, batch_tokens: List[List[int]]) -> List[str]:
+        """
+        Decodes lists of tokens into strings.
+
+        Args:
+            batch_tokens: The token lists to decode.
+
+        Returns:
+            A list of decoded strings, one per token list.
+        """
+        return [self.decode(tokens) for tokens in batch_tokens]
+
 
 class TiktokenTokenizer(Tokenizer):
     """
@@ -701,6 +741,30 @@ class TiktokenTokenizer(Tokenizer):
         except KeyError:
             raise ValueError(f"Invalid model_name: {model_name}.")
 
+    def encode_batch(self, contents: List[str]) -> List[List[int]]:
+        """
+        Encodes a list of strings in one call using tiktoken's batch encoder.
+
+        Args:
+            contents: The strings to encode.
+
+        Returns:
+            A list of token lists, one per input string.
+        """
+        return self.tokenizer.encode_batch(contents)
+
+    def decode_batch(self, batch_tokens: List[List[int]]) -> List[str]:
+        """
+        Decodes lists of tokens in one call using tiktoken's batch decoder.
+
+        Args:
+            batch_tokens: The token lists to decode.
+
+        Returns:
+            A list of decoded strings, one per token list.
+        """
+        return self.tokenizer.decode_batch(batch_tokens)
+
 
 def pack_user_ass_to_openai_messages(*args: str):
     roles = ["user", "assistant"]
@@ -709,15 +773,29 @@ def pack_user_ass_to_openai_messages(*args: str):
     ]
 
 
+@lru_cache(maxsize=64)
+def _multi_marker_pattern(markers: tuple[str, ...]) -> re.Pattern:
+    """Compiled alternation of the escaped markers, built once per marker set"""
+    return re.compile("|".join(re.escape(marker) for marker in markers))
+
+
 def split_string_by_multi_markers(content: str, markers: list[str]) -> list[str]:
     """Split a string by multiple markers"""
     if not markers:
         return [content]
     content = content if content is not None else ""
-    results = re.split("|".join(re.escape(marker) for marker in markers), content)
+    if len(markers) == 1 and markers[0]:
+        # A single non-empty literal marker needs no regex
+        results = content.split(markers[0])
+    else:
+        results = _multi_marker_pattern(tuple(markers)).split(content)
     return [r.strip() for r in results if r.strip()]
 
 
+_CONTROL_CHARS_RE = re.compile(r"[\x00-\x1f\x7f-\x9f]")
+_FLOAT_RE = re.compile(r"^[-+]?[0-9]*\.?[0-9]+$")
+
+
 # Refer the utils functions of the official GraphRAG implementation:
 # https://github.com/microsoft/graphrag
 def clean_str(input: Any) -> str:
@@ -728,11 +806,11 @@ def clean_str(input: Any) -> str:
 
     result = html.unescape(input.strip())
     # https://stackoverflow.com/questions/4324790/removing-control-characters-from-a-string-in-python
-    return re.sub(r"[\x00-\x1f\x7f-\x9f]", "", result)
+    return _CONTROL_CHARS_RE.sub("", result)
 
 
 def is_float_regex(value: str) -> bool:
-    return bool(re.match(r"^[-+]?[0-9]*\.?[0-9]+$", value))
+    return bool(_FLOAT_RE.match(value))
 
 
 def truncate_list_by_token_size(
@@ -1534,6 +1612,8 @@ async def use_llm_func_with_cache(
     max_tokens: int = None,
     history_messages: list[dict[str, str]] = None,
     cache_type: str = "extract",
+    args_hash: str | None = None,
+    skip_cache_lookup: bool = False,
 ) -> str:
     """Call LLM function with cache support
 
@@ -1547,6 +1627,8 @@ async def use_llm_func_with_cache(
         max_tokens: Maximum tokens for generation
         history_messages: History messages list
         cache_type: Type of cache
+        args_hash: Precomputed cache key; defaults to the hash of the prompt
+        skip_cache_lookup: Caller already missed the cache for this key; only save
 
     Returns:
         LLM response text
@@ -1558,18 +1640,19 @@ async def use_llm_func_with_cache(
         else:
             _prompt = input_text
 
-        arg_hash = compute_args_hash(_prompt)
-        cached_return, _1, _2, _3 = await handle_cache(
-            llm_response_cache,
-            arg_hash,
-            _prompt,
-            "default",
-            cache_type=cache_type,
-        )
-        if cached_return:
-            logger.debug(f"Found cache for {arg_hash}")
-            statistic_data["llm_cache"] += 1
-            return cached_return
+        arg_hash = args_hash or compute_args_hash(_prompt)
+        if not skip_cache_lookup:
+            cached_return, _1, _2, _3 = await handle_cache(
+                llm_response_cache,
+                arg_hash,
+                _prompt,
+                "default",
+                cache_type=cache_type,
+            )
+            if cached_return:
+                logger.debug(f"Found cache for {arg_hash}")
+                statistic_data["llm_cache"] += 1
+                return cached_return
         statistic_data["llm_call"] += 1
 
         # Call LLM
@@ -1621,6 +1704,7 @@ def get_content_summary(content: str, max_length: int = 250) -> str:
     return content[:max_length] + "..."
 
 
+@lru_cache(maxsize=10_000)
 def normalize_extracted_info(name: str, is_entity=False) -> str:
     """Normalize entity/relation names and description with the following rules:
     1. Remove spaces between Chinese characters
@@ -1632,6 +1716,8 @@ def normalize_extracted_info(name: str, is_entity=False) -> str:
     7. Remove English quotation marks in and around chinese
     8. Remove Chinese quotation marks
 
+    Results are memoized since the same names recur across many records.
+
     Args:
         name: Entity name to normalize
 